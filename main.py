@@ -1,12 +1,19 @@
 import os
 import json
+import bisect
 import aiohttp
 import asyncio
+from datetime import date, datetime, timedelta
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from bs4 import BeautifulSoup
 
+try:
+    from playwright.async_api import async_playwright
+except ImportError:  # 브라우저 조회는 선택 기능
+    async_playwright = None
+
 # ------------------------------
 # 설정
 # ------------------------------
@@ -22,19 +29,65 @@ SERVER_BASE_URL = os.environ.get("SERVER_BASE_URL", "https://kselnoti-command.on
 
 CHECK_INTERVAL_SECONDS = 3600  # 1시간
 
+# 크레피아 조회 방식: auto(aiohttp 우선, 필요 시 브라우저) / aiohttp / browser
+FETCH_BACKENDS = ("auto", "aiohttp", "browser")
+DEFAULT_BROWSER_POOL_SIZE = 2
+BROWSER_TIMEOUT_MS = 15000
+BROWSER_RETRY_MIN_SECONDS = 30    # 브라우저 재실행 실패 후 다음 시도까지 대기 (실패할 때마다 2배)
+BROWSER_RETRY_MAX_SECONDS = 1800
+
+
+def _read_fetch_backend(value: str | None) -> str:
+    backend = (value or "auto").strip().lower()
+    if backend not in FETCH_BACKENDS:
+        print(f"⚠ 알 수 없는 FETCH_BACKEND={value!r}: auto 로 동작")
+        return "auto"
+    return backend
+
+
+def _read_browser_pool_size(value: str | None) -> int:
+    """0 이면 브라우저 조회 끔."""
+    try:
+        return max(0, int(value if value is not None else DEFAULT_BROWSER_POOL_SIZE))
+    except ValueError:
+        print(f"⚠ 잘못된 BROWSER_POOL_SIZE={value!r}: {DEFAULT_BROWSER_POOL_SIZE} 로 동작")
+        return DEFAULT_BROWSER_POOL_SIZE
+
+
+FETCH_BACKEND = _read_fetch_backend(os.environ.get("FETCH_BACKEND"))
+BROWSER_POOL_SIZE = _read_browser_pool_size(os.environ.get("BROWSER_POOL_SIZE"))
+
+LIST_PAGE_SIZE = 20      # /kselnoti list 기본 페이지 크기
+LIST_MAX_PAGE_SIZE = 50  # 두레이 메시지 잘림 방지
+
+EXPIRY_CHECK_INTERVAL_SECONDS = 86400  # 1일
+EXPIRY_ALERT_DAYS = [30, 7, 1]         # 만료 N일 전 알림 (큰 값부터)
+EXPIRY_MAX_DAYS = 3650                 # /kselnoti expiring 최대 조회 일수
+EXPIRY_MAX_LINES = 20                  # 만료 목록 메시지에 표시할 최대 모델 수
+EXPIRY_ALERT_FILE = os.path.join(BASE_DIR, "expiry_alerts.json")  # 보낸 만료 알림 기록
+
 
 # ------------------------------
 # 수명주기: 앱 시작 시 스케줄러 실행
 # ------------------------------
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    task = asyncio.create_task(monitor_loop())
+    tasks = [
+        asyncio.create_task(monitor_loop()),
+        asyncio.create_task(expiry_alert_loop()),
+    ]
+    # 브라우저 실행/워밍업은 기동(헬스체크)을 막지 않도록 백그라운드로. 준비 전 조회는 aiohttp 사용
+    if FETCH_BACKEND != "aiohttp" and BROWSER_POOL_SIZE >= 1:
+        tasks.append(asyncio.create_task(browser_pool.start()))
     yield
-    task.cancel()
-    try:
-        await task
-    except asyncio.CancelledError:
-        pass
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await browser_pool.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -43,24 +96,58 @@ app = FastAPI(lifespan=lifespan)
 # ------------------------------
 # JSON 유틸
 # ------------------------------
+# models.json 의 메모리 사본과 읽을 당시 파일 상태 (mtime_ns, size).
+# 파일이 다른 프로세스(다른 워커, test_check.py 등)에서 바뀌면 다음 조회 때 다시 읽음.
+# 읽기-수정-쓰기 사이의 동시 쓰기는 기존과 마찬가지로 막지 않으므로 워커는 1개를 전제로 함.
+_models_cache: list[dict] | None = None
+_models_stamp: tuple[int, int] | None = None
+
+
+def _model_file_stamp() -> tuple[int, int] | None:
+    try:
+        st = os.stat(MODEL_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _registry() -> list[dict]:
+    """파일 상태가 바뀌었으면 다시 읽은 공유 사본 반환. 호출 측에서 수정하면 안 됨."""
+    global _models_cache, _models_stamp, _expiry_index_loaded
+    stamp = _model_file_stamp()
+    if _models_cache is None or stamp != _models_stamp:
+        if stamp is None:
+            models = []
+        else:
+            with open(MODEL_FILE, "r", encoding="utf-8") as f:
+                models = json.load(f)
+        _models_cache, _models_stamp = models, stamp
+        # 파일에서 파생된 정렬 키 / 만료일 인덱스도 다시 만들도록 함
+        _list_sort_cache.clear()
+        _expiry_index_loaded = False
+    return _models_cache
+
+
 def load_models() -> list[dict]:
-    if not os.path.exists(MODEL_FILE):
-        return []
-    with open(MODEL_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """등록 모델 목록의 복사본 (수정 후 save_models 로 저장)."""
+    return [dict(m) for m in _registry()]
 
 
 def save_models(models: list[dict]):
+    global _models_cache, _models_stamp
     with open(MODEL_FILE, "w", encoding="utf-8") as f:
         json.dump(models, f, ensure_ascii=False, indent=2)
+    _models_cache = [dict(m) for m in models]
+    _models_stamp = _model_file_stamp()
+    _list_sort_cache.clear()
 
 
 def add_model_entry(entry: dict):
     """모델 등록. 중복 시 기존 데이터 유지."""
     models = load_models()
     if not any(m.get("model") == entry.get("model") for m in models):
-        models.append(entry)
-        save_models(models)
+        save_models(models + [entry])
+        index_model_expiry(entry.get("model"), entry.get("exp_date"))
         return True
     return False  # 이미 등록됨
 
@@ -71,6 +158,7 @@ def remove_model_entry(model_name: str) -> bool:
     if len(new_models) == len(models):
         return False  # 없던 모델
     save_models(new_models)
+    unindex_model_expiry(model_name)
     return True
 
 
@@ -80,68 +168,469 @@ def update_model_snapshot(model_name: str, new_data: dict):
     for m in models:
         if m.get("model") == model_name:
             m.update(new_data)
+            save_models(models)
+            index_model_expiry(model_name, m.get("exp_date"))
             break
-    save_models(models)
+
+
+# ------------------------------
+# 만료일 인덱스
+# exp_date("YYYY.MM.DD")를 한 번만 파싱해 (만료일, 모델명) 정렬 배열로 유지.
+# 등록/해제/갱신 시 함께 갱신되며, 범위 조회는 bisect 로 O(log n).
+# ------------------------------
+_expiry_index: list[tuple[date, str]] = []   # (만료일, 모델명) 오름차순
+_expiry_by_model: dict[str, date] = {}       # 모델명 → 인덱스에 들어간 만료일
+_expiry_index_loaded = False
+
+
+def parse_date(value: str | None) -> date | None:
+    """'YYYY.MM.DD' 형식(인증일/만료일 공통)을 date 로 변환. 형식이 맞지 않으면 None."""
+    try:
+        return datetime.strptime((value or "").strip(), "%Y.%m.%d").date()
+    except ValueError:
+        return None
+
+
+def _ensure_expiry_index():
+    """최초 사용 시 (또는 models.json 이 밖에서 바뀐 뒤) 인덱스를 구성."""
+    global _expiry_index_loaded
+    models = _registry()
+    if _expiry_index_loaded:
+        return
+    _expiry_index.clear()
+    _expiry_by_model.clear()
+    _expiry_index_loaded = True
+    for m in models:
+        index_model_expiry(m.get("model"), m.get("exp_date"))
+
+
+def unindex_model_expiry(model_name: str):
+    if not _expiry_index_loaded:
+        return
+    exp = _expiry_by_model.pop(model_name, None)
+    if exp is None:
+        return
+    i = bisect.bisect_left(_expiry_index, (exp, model_name))
+    if i < len(_expiry_index) and _expiry_index[i] == (exp, model_name):
+        del _expiry_index[i]
+
+
+def index_model_expiry(model_name: str | None, exp_date: str | None):
+    """모델의 만료일을 인덱스에 반영 (기존 값은 교체, 파싱 불가 시 제외)."""
+    if not _expiry_index_loaded or not model_name:
+        return
+    unindex_model_expiry(model_name)
+    exp = parse_date(exp_date)
+    if exp is None:
+        return
+    bisect.insort(_expiry_index, (exp, model_name))
+    _expiry_by_model[model_name] = exp
+
+
+def find_expiring_models(start: date, end: date) -> list[tuple[date, str]]:
+    """만료일이 start 이상 end 이하인 (만료일, 모델명) 목록."""
+    _ensure_expiry_index()
+    lo = bisect.bisect_left(_expiry_index, (start, ""))
+    if end >= date.max:
+        return _expiry_index[lo:]
+    hi = bisect.bisect_left(_expiry_index, (end + timedelta(days=1), ""))
+    return _expiry_index[lo:hi]
+
+
+def format_expiring_lines(expiring: list[tuple[date, str]], today: date) -> list[str]:
+    """만료 예정 목록을 메시지 줄로 변환. EXPIRY_MAX_LINES 를 넘는 부분은 개수만 표시."""
+    lines = [
+        f"- {model_name} | 만료일: {exp:%Y.%m.%d} (D-{(exp - today).days})"
+        for exp, model_name in expiring[:EXPIRY_MAX_LINES]
+    ]
+    if len(expiring) > EXPIRY_MAX_LINES:
+        lines.append(f"… 외 {len(expiring) - EXPIRY_MAX_LINES}개")
+    return lines
+
+
+# ------------------------------
+# 목록 조회 (필터 / 정렬 / 커서 페이지)
+# 정렬 키는 정렬 기준별로 한 번만 계산해 두고, 저장하거나 파일이 바뀌면 무효화.
+# 커서는 직전 페이지 마지막 항목의 정렬 키이며 bisect 로 다음 위치를 찾음.
+# 모델명 정렬이면 "모델명", 날짜 정렬이면 "YYYY.MM.DD|모델명" (날짜엔 '|'가 없으므로 첫 '|'에서 나눔).
+# ------------------------------
+LIST_SORT_FIELDS = ["model", "exp_date", "cert_date"]
+
+# 정렬 기준 → (정렬 키 목록, 같은 순서의 모델 목록)
+_list_sort_cache: dict[str, tuple[list[tuple[str, str]], list[dict]]] = {}
+
+
+def _list_sort_key(m: dict, field: str) -> tuple[str, str]:
+    model_name = m.get("model") or ""
+    if field == "model":
+        return (model_name, model_name)
+    parsed = parse_date(m.get(field))
+    # 날짜가 없거나 형식이 맞지 않으면 맨 뒤로
+    return (parsed.strftime("%Y.%m.%d") if parsed else "~", model_name)
+
+
+def _encode_cursor(key: tuple[str, str], field: str) -> str:
+    return key[1] if field == "model" else f"{key[0]}|{key[1]}"
+
+
+def _decode_cursor(cursor: str, field: str) -> tuple[str, str]:
+    if field == "model":
+        return (cursor, cursor)
+    key_part, _, model_part = cursor.partition("|")
+    return (key_part, model_part)
+
+
+def _sorted_models(field: str) -> tuple[list[tuple[str, str]], list[dict]]:
+    models = _registry()
+    if field not in _list_sort_cache:
+        pairs = sorted(((_list_sort_key(m, field), m) for m in models), key=lambda p: p[0])
+        _list_sort_cache[field] = ([k for k, _ in pairs], [m for _, m in pairs])
+    return _list_sort_cache[field]
+
+
+def query_models(
+    status: str | None = None,
+    prefix: str | None = None,
+    exp_from: date | None = None,
+    exp_to: date | None = None,
+    sort: str = "model",
+    cursor: str | None = None,
+    limit: int = LIST_PAGE_SIZE,
+) -> tuple[list[dict], str | None]:
+    """조건에 맞는 모델을 최대 limit 개 반환. 다음 페이지가 있으면 커서도 함께 반환."""
+    keys, ordered = _sorted_models(sort)
+
+    start, stop = 0, len(ordered)
+    if cursor:
+        start = bisect.bisect_right(keys, _decode_cursor(cursor, sort))
+    if sort == "model" and prefix:
+        start = max(start, bisect.bisect_left(keys, (prefix, "")))
+
+    # 만료일 범위: 만료일 정렬이면 정렬 키에서 바로 구간을 자르고, 아니면 만료일 인덱스로 대상 모델을 구함
+    in_exp_range: set[str] | None = None
+    if exp_from or exp_to:
+        if sort == "exp_date":
+            if exp_from:
+                start = max(start, bisect.bisect_left(keys, (f"{exp_from:%Y.%m.%d}", "")))
+            if exp_to:
+                stop = bisect.bisect_right(keys, (f"{exp_to:%Y.%m.%d}", "\U0010ffff"))
+            else:
+                stop = bisect.bisect_left(keys, ("~", ""))  # 만료일 없는 모델 제외
+        else:
+            in_exp_range = {
+                name for _, name in find_expiring_models(exp_from or date.min, exp_to or date.max)
+            }
+
+    page: list[dict] = []
+    for i in range(start, stop):
+        m = ordered[i]
+        model_name = m.get("model") or ""
+        if prefix and not model_name.startswith(prefix):
+            if sort == "model":
+                break  # 모델명 정렬이면 접두어 범위를 벗어난 것
+            continue
+        if status and m.get("status") != status:
+            continue
+        if in_exp_range is not None and model_name not in in_exp_range:
+            continue
+        if len(page) == limit:
+            return page, _encode_cursor(_list_sort_key(page[-1], sort), sort)
+        page.append(m)
+    return page, None
+
+
+def parse_list_args(args: list[str]) -> dict:
+    """`key=value` 형태의 list 옵션을 query_models 인자로 변환. 잘못된 값은 ValueError."""
+    options: dict = {}
+    for arg in args:
+        key, sep, value = arg.partition("=")
+        key = key.lower()
+        if not sep or not value:
+            raise ValueError(arg)
+        if key in ("status", "prefix", "cursor"):
+            options[key] = value
+        elif key in ("from", "to"):
+            parsed = parse_date(value)
+            if parsed is None:
+                raise ValueError(arg)
+            options["exp_from" if key == "from" else "exp_to"] = parsed
+        elif key == "sort":
+            if value not in LIST_SORT_FIELDS:
+                raise ValueError(arg)
+            options["sort"] = value
+        elif key == "limit":
+            if not value.isdecimal() or int(value) < 1:
+                raise ValueError(arg)
+            options["limit"] = min(int(value), LIST_MAX_PAGE_SIZE)
+        else:
+            raise ValueError(arg)
+    return options
 
 
 # ------------------------------
 # 크레피아 조회
 # ------------------------------
+def _search_payload(model_name: str) -> dict:
+    return {
+        "searchKey": "03",
+        "searchValue": model_name,
+        "currentPage": "1"
+    }
+
+
+def page_needs_browser(soup: BeautifulSoup) -> bool:
+    """결과 테이블 자체가 없으면 스크립트로 그려지는 페이지로 보고 브라우저 조회로 넘김.
+    (테이블은 있는데 행이 없으면 단순히 조회 결과가 없는 것)"""
+    return soup.select_one("table") is None
+
+
+def parse_model_rows(soup: BeautifulSoup) -> list[dict]:
+    results = []
+    for row in soup.select("table tbody tr"):
+        cols = row.find_all("td")
+        if len(cols) >= 8:
+            cert_no   = cols[2].text.strip()
+            identifier = cols[3].text.strip().split()[0]
+            model     = cols[5].text.strip().split()[0]
+
+            date_parts = cols[6].text.strip().split()
+            cert_date  = date_parts[0]
+            exp_date   = date_parts[1] if len(date_parts) > 1 else ""
+
+            # 인증 상태 (승인 / 취소 등) - 컬럼 수에 따라 조정
+            status = cols[7].text.strip() if len(cols) > 7 else ""
+
+            results.append({
+                "cert_no":    cert_no,
+                "identifier": identifier,
+                "model":      model,
+                "cert_date":  cert_date,
+                "exp_date":   exp_date,
+                "status":     status,
+            })
+    return results
+
+
+async def fetch_html_aiohttp(model_name: str) -> str:
+    async with aiohttp.ClientSession() as client:
+        async with client.post(SEARCH_URL, data=_search_payload(model_name), timeout=aiohttp.ClientTimeout(total=15)) as response:
+            return await response.text()
+
+
 async def fetch_model_info(model_name: str) -> list[dict]:
     try:
-        async with aiohttp.ClientSession() as client:
-            payload = {
-                "searchKey": "03",
-                "searchValue": model_name,
-                "currentPage": "1"
-            }
-            async with client.post(SEARCH_URL, data=payload, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                text = await response.text()
-                soup = BeautifulSoup(text, "html.parser")
-
-                rows = soup.select("table tbody tr")
-                if not rows:
-                    return []
-
-                results = []
-                for row in rows:
-                    cols = row.find_all("td")
-                    if len(cols) >= 8:
-                        cert_no   = cols[2].text.strip()
-                        identifier = cols[3].text.strip().split()[0]
-                        model     = cols[5].text.strip().split()[0]
-
-                        date_parts = cols[6].text.strip().split()
-                        cert_date  = date_parts[0]
-                        exp_date   = date_parts[1] if len(date_parts) > 1 else ""
-
-                        # 인증 상태 (승인 / 취소 등) - 컬럼 수에 따라 조정
-                        status = cols[7].text.strip() if len(cols) > 7 else ""
-
-                        results.append({
-                            "cert_no":    cert_no,
-                            "identifier": identifier,
-                            "model":      model,
-                            "cert_date":  cert_date,
-                            "exp_date":   exp_date,
-                            "status":     status,
-                        })
-                return results
+        # browser 모드라도 풀을 쓸 수 없으면 aiohttp 로 조회
+        if FETCH_BACKEND != "browser" or not await browser_pool.ensure_available():
+            soup = BeautifulSoup(await fetch_html_aiohttp(model_name), "html.parser")
+            if FETCH_BACKEND == "aiohttp" or not page_needs_browser(soup):
+                return parse_model_rows(soup)
+            if not await browser_pool.ensure_available():
+                print(f"  ⚠ {model_name}: 결과 테이블 없음, 브라우저 조회 불가")
+                return []
+            print(f"  ↪ {model_name}: 결과 테이블 없음, 브라우저 조회로 전환")
+
+        soup = BeautifulSoup(await browser_pool.fetch_html(model_name), "html.parser")
+        return parse_model_rows(soup)
     except Exception as e:
         print(f"❌ fetch_model_info 오류: {e}")
         return []
 
 
+# ------------------------------
+# 헤드리스 브라우저 풀 (Playwright)
+# 브라우저는 앱 수명 동안 하나만 띄우고, 컨텍스트+페이지를 BROWSER_POOL_SIZE 개 만들어 재사용.
+# 이미지/CSS/폰트 요청은 페이지마다 차단.
+# ------------------------------
+BLOCKED_RESOURCE_TYPES = {"image", "stylesheet", "font", "media"}
+
+
+async def _block_static_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class BrowserPool:
+    def __init__(self, size: int):
+        self.size = size
+        self._playwright = None
+        self._browser = None
+        self._pages: asyncio.Queue = asyncio.Queue()
+        self._generation = 0  # stop 할 때마다 증가. 이전 브라우저의 페이지가 새 풀에 섞이지 않게 함
+        self._lock = asyncio.Lock()  # 시작/재시작 직렬화
+        self._wanted = False  # start 가 호출됐고 close 전인지 (재시도 여부 판단)
+        self._retry_at = 0.0
+        self._retry_delay = BROWSER_RETRY_MIN_SECONDS
+
+    @property
+    def available(self) -> bool:
+        return self._browser is not None
+
+    async def start(self):
+        """브라우저 실행 + 페이지 미리 생성 (워밍업). 실패 시 aiohttp 로 조회하다가 나중에 재시도."""
+        async with self._lock:
+            await self._start()
+
+    async def _start(self):
+        if self.size < 1:
+            print("⚠ BROWSER_POOL_SIZE=0: 브라우저 조회 비활성화")
+            return
+        if async_playwright is None:
+            print("⚠ playwright 미설치: 브라우저 조회 비활성화")
+            return
+        self._wanted = True
+        browser = None
+        try:
+            self._playwright = await async_playwright().start()
+            browser = await self._playwright.chromium.launch(headless=True)
+            pages = [await self._new_page(browser) for _ in range(self.size)]
+        except Exception as e:
+            print(f"❌ 브라우저 풀 시작 실패: {e}")
+            self._browser = browser  # stop 에서 함께 정리
+            await self.stop()
+            loop_time = asyncio.get_running_loop().time()
+            self._retry_at = loop_time + self._retry_delay
+            self._retry_delay = min(self._retry_delay * 2, BROWSER_RETRY_MAX_SECONDS)
+            return
+
+        # 페이지가 준비된 뒤에야 사용 가능 상태로 전환
+        self._browser = browser
+        self._retry_delay = BROWSER_RETRY_MIN_SECONDS
+        try:
+            # 첫 조회 지연을 줄이기 위해 검색 페이지를 한 번 열어 둠 (실패해도 풀은 그대로 사용)
+            await pages[0].goto(SEARCH_URL, wait_until="domcontentloaded", timeout=BROWSER_TIMEOUT_MS)
+        except Exception as e:
+            print(f"⚠ 브라우저 워밍업 실패 (무시): {e}")
+        for page in pages:
+            self._pages.put_nowait(page)
+        print(f"✅ 브라우저 풀 준비 완료 ({self.size}개 페이지)")
+
+    async def stop(self):
+        # 먼저 사용 불가 상태로 만들어 진행 중인 조회가 새 페이지를 반납하지 않게 함
+        self._generation += 1
+        self._pages = asyncio.Queue()
+        browser, self._browser = self._browser, None
+        playwright, self._playwright = self._playwright, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                print(f"⚠ 브라우저 종료 오류: {e}")
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception as e:
+                print(f"⚠ playwright 종료 오류: {e}")
+
+    async def close(self):
+        """앱 종료 시 호출. 이후로는 재시도하지 않음."""
+        self._wanted = False
+        await self.stop()
+
+    async def restart(self):
+        """브라우저가 죽었거나 페이지를 다시 만들 수 없을 때 재실행. 실패하면 backoff 후 재시도."""
+        generation = self._generation
+        async with self._lock:
+            if generation != self._generation:
+                return  # 다른 조회가 이미 재시작함
+            print("↻ 브라우저 풀 재시작")
+            await self.stop()
+            await self._start()
+
+    async def ensure_available(self) -> bool:
+        """사용 불가 상태면 재시도 간격이 지났을 때 다시 띄워 봄. 시작 중이면 기다리지 않음."""
+        if self.available:
+            return True
+        if not self._wanted or self._lock.locked():
+            return False
+        if asyncio.get_running_loop().time() < self._retry_at:
+            return False
+        await self.restart()
+        return self.available
+
+    async def _new_page(self, browser=None):
+        context = await (browser or self._browser).new_context()
+        page = await context.new_page()
+        await page.route("**/*", _block_static_resources)
+        return page
+
+    async def _release(self, page, generation: int):
+        """페이지 반납. 버린 페이지는 새로 만들어 채우고, 그것도 안 되면 브라우저 재시작."""
+        if generation != self._generation:
+            return  # 그 사이 재시작/종료된 풀의 페이지
+        if page is None:
+            try:
+                page = await self._new_page()
+            except Exception as e:
+                print(f"❌ 브라우저 페이지 재생성 실패: {e}")
+                await self.restart()
+                return
+        self._pages.put_nowait(page)
+
+    async def fetch_html(self, model_name: str) -> str:
+        if self._browser is not None and not self._browser.is_connected():
+            print("⚠ 브라우저 연결 끊김")
+            await self.restart()
+        if not self.available:
+            raise RuntimeError("브라우저 풀이 시작되지 않았습니다")
+
+        generation = self._generation
+        try:
+            page = await asyncio.wait_for(self._pages.get(), BROWSER_TIMEOUT_MS / 1000)
+        except asyncio.TimeoutError:
+            raise RuntimeError("사용 가능한 브라우저 페이지가 없습니다 (대기 시간 초과)")
+
+        try:
+            await page.goto(SEARCH_URL, wait_until="domcontentloaded", timeout=BROWSER_TIMEOUT_MS)
+            # 검색 폼과 같은 파라미터로 POST 제출 후 결과 렌더링 대기
+            async with page.expect_navigation(wait_until="networkidle", timeout=BROWSER_TIMEOUT_MS):
+                await page.evaluate(
+                    """([url, payload]) => {
+                        const form = document.createElement("form");
+                        form.method = "POST";
+                        form.action = url;
+                        for (const [name, value] of Object.entries(payload)) {
+                            const input = document.createElement("input");
+                            input.type = "hidden";
+                            input.name = name;
+                            input.value = value;
+                            form.appendChild(input);
+                        }
+                        document.body.appendChild(form);
+                        form.submit();
+                    }""",
+                    [SEARCH_URL, _search_payload(model_name)],
+                )
+            return await page.content()
+        except BaseException:
+            # 실패/취소로 상태를 알 수 없는 페이지는 버림 (닫기 실패는 무시하고 원래 오류 유지)
+            broken, page = page, None
+            try:
+                await broken.context.close()
+            except Exception:
+                pass
+            raise
+        finally:
+            await self._release(page, generation)
+
+
+browser_pool = BrowserPool(BROWSER_POOL_SIZE)
+
+
 # ------------------------------
 # 두레이 메시지 전송
 # ------------------------------
-async def send_dooray_message(text: str):
+async def send_dooray_message(text: str) -> bool:
+    """전송 성공 여부 반환 (실패는 로그만 남김)."""
     try:
         async with aiohttp.ClientSession() as session:
             res = await session.post(DOORAY_WEBHOOK_URL, json={"text": text})
             print("✅ Dooray 응답:", res.status)
+            return res.status < 300
     except Exception as e:
         print(f"❌ Dooray 전송 실패: {e}")
+        return False
 
 
 # ------------------------------
@@ -253,6 +742,80 @@ async def check_all_models():
             update_model_snapshot(model_name, latest)
 
 
+# ------------------------------
+# 만료 임박 알림 (로컬 타이머, 크레피아 조회 없음)
+# ------------------------------
+# 이미 보낸 알림 키 "모델명|만료일|기준일". 재시작 시 중복 발송을 막기 위해 파일에 보관.
+_expiry_alerted: set[str] | None = None
+
+
+def load_expiry_alerted() -> set[str]:
+    global _expiry_alerted
+    if _expiry_alerted is None:
+        _expiry_alerted = set()
+        if os.path.exists(EXPIRY_ALERT_FILE):
+            try:
+                with open(EXPIRY_ALERT_FILE, "r", encoding="utf-8") as f:
+                    _expiry_alerted = set(json.load(f))
+            except (OSError, ValueError, TypeError) as e:
+                print(f"❌ 만료 알림 기록 읽기 실패 (빈 기록으로 시작): {e}")
+    return _expiry_alerted
+
+
+def save_expiry_alerted(alerted: set[str]):
+    with open(EXPIRY_ALERT_FILE, "w", encoding="utf-8") as f:
+        json.dump(sorted(alerted), f, ensure_ascii=False, indent=2)
+
+
+def mark_expiry_alerted(keys: list[str], today: date):
+    """보낸 알림 키를 기록. 이미 지난 만료일의 기록은 함께 정리."""
+    alerted = load_expiry_alerted()
+    alerted.update(keys)
+    alerted -= {k for k in alerted if (parse_date(k.split("|")[-2]) or today) < today}
+    save_expiry_alerted(alerted)
+
+
+async def expiry_alert_loop():
+    """서버 시작 직후와 이후 1일마다 만료 임박 모델을 알림."""
+    print("✅ 만료 알림 스케줄러 시작")
+    while True:
+        try:
+            await check_expiring_models()
+        except Exception as e:
+            print(f"❌ 만료 알림 확인 오류: {e}")
+        await asyncio.sleep(EXPIRY_CHECK_INTERVAL_SECONDS)
+
+
+def collect_expiry_alerts(today: date) -> list[tuple[date, str, list[str]]]:
+    """새 기준일(D-30/7/1)에 들어선 모델의 (만료일, 모델명, 알림 키 목록). 기록은 하지 않음."""
+    alerted = load_expiry_alerted()
+    due = []
+    for exp, model_name in find_expiring_models(today, today + timedelta(days=max(EXPIRY_ALERT_DAYS))):
+        left = (exp - today).days
+        # 여러 기준일에 한꺼번에 들어선 경우(서버 중단 등)에도 알림은 한 번
+        keys = [
+            f"{model_name}|{exp:%Y.%m.%d}|{days}"
+            for days in EXPIRY_ALERT_DAYS
+            if left <= days
+        ]
+        new_keys = [k for k in keys if k not in alerted]
+        if new_keys:
+            due.append((exp, model_name, new_keys))
+    return due
+
+
+async def check_expiring_models(today: date | None = None):
+    today = today or date.today()
+    due = collect_expiry_alerts(today)
+    # EXPIRY_MAX_LINES 개씩 나눠 보내고, 전송에 성공한 묶음만 보낸 것으로 기록 (실패분은 다음 실행 때 재시도)
+    for i in range(0, len(due), EXPIRY_MAX_LINES):
+        chunk = due[i:i + EXPIRY_MAX_LINES]
+        lines = ["⏰ *인증 만료 임박 모델*"] + format_expiring_lines([(exp, m) for exp, m, _ in chunk], today)
+        if not await send_dooray_message("\n".join(lines)):
+            break
+        mark_expiry_alerted([k for _, _, keys in chunk for k in keys], today)
+
+
 def detect_changes(old: dict, new: dict) -> list[str]:
     """변경된 필드 목록 반환."""
     watch_fields = ["cert_no", "cert_date", "exp_date", "status", "identifier"]
@@ -279,7 +842,9 @@ async def notify_change(model_name: str, old: dict, new: dict, changed_fields: l
 # /kselnoti  슬래시 커맨드
 # 사용법:
 #   /kselnoti <모델명>    → 조회 후 등록 여부 확인
-#   /kselnoti list        → 등록된 모델 목록
+#   /kselnoti list [status=] [prefix=] [from=] [to=] [sort=] [limit=] [cursor=]
+#                         → 등록된 모델 목록 (필터/정렬/페이지)
+#   /kselnoti expiring <일수> → N일 이내 만료 예정 모델
 #   /kselnoti remove <모델명> → 등록 해제
 # ------------------------------
 @app.post("/kselnoti")
@@ -307,7 +872,9 @@ async def kselnoti(request: Request):
             "text": (
                 "⚠ 사용법:\n"
                 "- `/kselnoti <모델명>` : 조회 후 알림 등록\n"
-                "- `/kselnoti list` : 등록 목록 보기\n"
+                "- `/kselnoti list [status=상태] [prefix=접두어] [from=YYYY.MM.DD] [to=YYYY.MM.DD] "
+                "[sort=model|exp_date|cert_date] [limit=N]` : 등록 목록 보기\n"
+                "- `/kselnoti expiring <일수>` : N일 이내 만료 모델 보기\n"
                 "- `/kselnoti remove <모델명>` : 등록 해제"
             )
         })
@@ -320,17 +887,42 @@ async def kselnoti(request: Request):
         else:
             return JSONResponse({"text": f"⚠ [{target}] 등록된 모델이 아닙니다."})
 
+    # ── expiring 커맨드 ──────────────────────────────
+    if text.lower() == "expiring" or text.lower().startswith("expiring "):
+        arg = text[8:].strip()
+        if not arg.isdecimal() or int(arg) > EXPIRY_MAX_DAYS:
+            return JSONResponse({"text": f"⚠ 사용법: `/kselnoti expiring <일수>` (0~{EXPIRY_MAX_DAYS})"})
+        days = int(arg)
+        today = date.today()
+        expiring = find_expiring_models(today, today + timedelta(days=days))
+        if not expiring:
+            return JSONResponse({"text": f"📅 {days}일 이내 만료 예정인 모델이 없습니다."})
+        lines = [f"📅 *{days}일 이내 만료 예정 모델*"] + format_expiring_lines(expiring, today)
+        return JSONResponse({"text": "\n".join(lines)})
+
     # ── list 커맨드 ────────────────────────────────
-    if text.lower() == "list":
-        models = load_models()
+    if text.lower() == "list" or text.lower().startswith("list "):
+        args = text.split()[1:]
+        try:
+            options = parse_list_args(args)
+        except ValueError as e:
+            return JSONResponse({"text": f"⚠ 잘못된 list 옵션: `{e}`"})
+
+        models, next_cursor = query_models(**options)
         if not models:
-            return JSONResponse({"text": "📋 등록된 모델이 없습니다."})
+            if not _registry():
+                return JSONResponse({"text": "📋 등록된 모델이 없습니다."})
+            return JSONResponse({"text": "📋 조건에 맞는 모델이 없습니다."})
+
         lines = ["📋 *등록된 알림 모델 목록*"]
         for m in models:
             lines.append(
                 f"- {m['model']} | 인증일: {m.get('cert_date','-')} | "
                 f"만료일: {m.get('exp_date','-')} | 상태: {m.get('status','-')}"
             )
+        if next_cursor:
+            next_args = [a for a in args if not a.lower().startswith("cursor=")]
+            lines.append(f"\n➡ 다음 페이지: `/kselnoti list {' '.join(next_args + [f'cursor={next_cursor}'])}`")
         return JSONResponse({"text": "\n".join(lines)})
 
     # ── 모델 조회 ──────────────────────────────────
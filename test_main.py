@@ -0,0 +1,620 @@
+import asyncio
+import json
+from datetime import date
+
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def tmp_registry(tmp_path, monkeypatch):
+    """models.json / 만료 알림 기록을 임시 경로로 돌리고 메모리 상태 초기화."""
+    monkeypatch.setattr(main, "MODEL_FILE", str(tmp_path / "models.json"))
+    monkeypatch.setattr(main, "EXPIRY_ALERT_FILE", str(tmp_path / "expiry_alerts.json"))
+    monkeypatch.setattr(main, "_models_cache", None)
+    monkeypatch.setattr(main, "_models_stamp", None)
+    monkeypatch.setattr(main, "_expiry_index_loaded", False)
+    monkeypatch.setattr(main, "_expiry_alerted", None)
+    main._list_sort_cache.clear()
+    main._expiry_index.clear()
+    main._expiry_by_model.clear()
+    yield tmp_path
+
+
+def entry(model, exp_date, **extra):
+    return {"model": model, "exp_date": exp_date, "cert_date": "2024.01.01", "status": "승인", **extra}
+
+
+class FakeRequest:
+    """슬래시 커맨드 JSON 본문만 흉내 내는 요청 객체."""
+
+    def __init__(self, text):
+        self._body = {"text": text}
+
+    async def form(self):
+        raise ValueError("not a form")
+
+    async def json(self):
+        return self._body
+
+
+def command(text) -> str:
+    response = asyncio.run(main.kselnoti(FakeRequest(text)))
+    return json.loads(response.body)["text"]
+
+
+# ------------------------------
+# 만료일 인덱스
+# ------------------------------
+def test_expiry_index_follows_add_remove_update():
+    main.add_model_entry(entry("A", "2026.11.05"))
+    assert main.find_expiring_models(date(2026, 11, 1), date(2026, 11, 30)) == [(date(2026, 11, 5), "A")]
+
+    main.add_model_entry(entry("B", "2026.11.03"))
+    main.add_model_entry(entry("C", "9999.99.99"))  # 파싱 불가 → 인덱스 제외
+    assert main.find_expiring_models(date(2026, 11, 1), date(2026, 11, 30)) == [
+        (date(2026, 11, 3), "B"),
+        (date(2026, 11, 5), "A"),
+    ]
+
+    main.update_model_snapshot("A", {"exp_date": "2026.12.01"})
+    assert main.find_expiring_models(date(2026, 11, 1), date(2026, 11, 30)) == [(date(2026, 11, 3), "B")]
+
+    main.remove_model_entry("B")
+    assert main.find_expiring_models(date(2026, 11, 1), date(2026, 12, 31)) == [(date(2026, 12, 1), "A")]
+
+
+def test_expiry_index_built_from_existing_file():
+    main.save_models([entry("A", "2026.11.05"), entry("B", "2026.10.20")])
+    assert [m for _, m in main.find_expiring_models(date(2026, 1, 1), date(2026, 12, 31))] == ["B", "A"]
+
+
+def test_find_expiring_models_open_end():
+    main.add_model_entry(entry("A", "2026.11.05"))
+    assert main.find_expiring_models(date(2026, 1, 1), date.max) == [(date(2026, 11, 5), "A")]
+
+
+def test_format_expiring_lines_caps_length(monkeypatch):
+    monkeypatch.setattr(main, "EXPIRY_MAX_LINES", 2)
+    today = date(2026, 11, 1)
+    lines = main.format_expiring_lines([(date(2026, 11, d), f"M{d}") for d in range(2, 7)], today)
+    assert lines == ["- M2 | 만료일: 2026.11.02 (D-1)", "- M3 | 만료일: 2026.11.03 (D-2)", "… 외 3개"]
+
+
+@pytest.fixture
+def dooray(monkeypatch):
+    """보낸 메시지를 모으는 가짜 전송. ok=False 로 바꾸면 전송 실패."""
+
+    class Sender:
+        def __init__(self):
+            self.ok = True
+            self.sent: list[str] = []
+
+        async def __call__(self, text):
+            if self.ok:
+                self.sent.append(text)
+            return self.ok
+
+    sender = Sender()
+    monkeypatch.setattr(main, "send_dooray_message", sender)
+    return sender
+
+
+def alerted_models(dooray) -> list[str]:
+    return [line[2:].split(" |")[0] for text in dooray.sent for line in text.splitlines() if line.startswith("- ")]
+
+
+def run_alerts(today):
+    asyncio.run(main.check_expiring_models(today))
+
+
+def test_expiry_alerts_sent_once_per_threshold(dooray):
+    today = date(2026, 11, 1)
+    main.add_model_entry(entry("A", "2026.11.06"))  # D-5
+    main.add_model_entry(entry("B", "2026.11.20"))  # D-19
+
+    run_alerts(today)
+    assert alerted_models(dooray) == ["A", "B"]
+    run_alerts(today)
+    assert alerted_models(dooray) == ["A", "B"]
+
+    # 하루 뒤: 새 기준일에 걸린 모델 없음
+    run_alerts(date(2026, 11, 2))
+    assert len(dooray.sent) == 1
+    # D-1 이 되면 다시 한 번
+    run_alerts(date(2026, 11, 5))
+    assert alerted_models(dooray) == ["A", "B", "A"]
+
+
+def test_expiry_alerts_survive_restart(monkeypatch, dooray):
+    today = date(2026, 11, 1)
+    main.add_model_entry(entry("A", "2026.11.06"))
+    run_alerts(today)
+
+    monkeypatch.setattr(main, "_expiry_alerted", None)  # 재시작
+    run_alerts(today)
+    assert len(dooray.sent) == 1
+
+
+def test_expiry_alerts_retried_after_failed_send(dooray):
+    today = date(2026, 11, 1)
+    main.add_model_entry(entry("A", "2026.11.06"))
+    dooray.ok = False
+    run_alerts(today)
+    assert main.load_expiry_alerted() == set()
+
+    dooray.ok = True
+    run_alerts(today)
+    assert alerted_models(dooray) == ["A"]
+
+
+def test_expiry_alerts_split_into_messages(monkeypatch, dooray):
+    monkeypatch.setattr(main, "EXPIRY_MAX_LINES", 2)
+    today = date(2026, 11, 1)
+    for i in range(5):
+        main.add_model_entry(entry(f"M{i}", f"2026.11.{i + 2:02d}"))
+    run_alerts(today)
+    assert len(dooray.sent) == 3
+    assert alerted_models(dooray) == [f"M{i}" for i in range(5)]
+    assert all("… 외" not in text for text in dooray.sent)
+
+
+def test_expiry_alerts_partial_failure_keeps_rest(monkeypatch, dooray):
+    monkeypatch.setattr(main, "EXPIRY_MAX_LINES", 2)
+    today = date(2026, 11, 1)
+    for i in range(4):
+        main.add_model_entry(entry(f"M{i}", f"2026.11.{i + 2:02d}"))
+
+    calls = []
+
+    async def fail_second(text):
+        calls.append(text)
+        return len(calls) == 1
+
+    monkeypatch.setattr(main, "send_dooray_message", fail_second)
+    run_alerts(today)
+    assert {k.split("|")[0] for k in main.load_expiry_alerted()} == {"M0", "M1"}
+
+    monkeypatch.setattr(main, "send_dooray_message", dooray)
+    run_alerts(today)
+    assert alerted_models(dooray) == ["M2", "M3"]
+
+
+def test_corrupt_alert_file_treated_as_empty(tmp_registry, dooray):
+    (tmp_registry / "expiry_alerts.json").write_text("{not json", encoding="utf-8")
+    main.add_model_entry(entry("A", "2026.11.06"))
+    run_alerts(date(2026, 11, 1))
+    assert alerted_models(dooray) == ["A"]
+
+
+def test_expiry_alert_loop_survives_errors(monkeypatch):
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        raise ValueError("bad models.json")
+
+    async def stop_after_two(seconds):
+        if len(calls) >= 2:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(main, "check_expiring_models", flaky)
+    monkeypatch.setattr(main.asyncio, "sleep", stop_after_two)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(main.expiry_alert_loop())
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("arg", ["99999999", "²", "-1", "abc"])
+def test_expiring_command_rejects_bad_days(arg):
+    assert command(f"expiring {arg}").startswith("⚠ 사용법")
+
+
+def test_expiring_command_lists_models():
+    main.add_model_entry(entry("A", date.today().strftime("%Y.%m.%d")))
+    assert "- A | 만료일:" in command("expiring 3")
+
+
+# ------------------------------
+# 목록 조회
+# ------------------------------
+def _fill_registry():
+    for i in range(9):
+        main.add_model_entry(entry(
+            f"KTC{i}",
+            f"2026.11.{20 - i:02d}",
+            cert_date=f"2024.01.{i + 1:02d}",
+            status="승인" if i % 2 else "취소",
+        ))
+    main.add_model_entry(entry("AB1", "9999.99.99", cert_date=""))
+
+
+def _all_pages(**options) -> list[str]:
+    names, cursor = [], None
+    while True:
+        page, cursor = main.query_models(cursor=cursor, limit=4, **options)
+        names += [m["model"] for m in page]
+        if cursor is None:
+            return names
+
+
+@pytest.mark.parametrize("sort", main.LIST_SORT_FIELDS)
+def test_list_cursor_walks_every_model_once(sort):
+    _fill_registry()
+    names = _all_pages(sort=sort)
+    assert sorted(names) == sorted(m["model"] for m in main.load_models())
+    assert names == [m["model"] for m in main._sorted_models(sort)[1]]
+
+
+@pytest.mark.parametrize("sort", main.LIST_SORT_FIELDS)
+def test_list_cursor_with_separator_in_model_name(sort):
+    for name in ["A|B", "A|B|C", "A", "B|", "|Z"]:
+        main.add_model_entry(entry(name, "2026.11.05"))
+    names = _all_pages(sort=sort)
+    assert sorted(names) == sorted(["A|B", "A|B|C", "A", "B|", "|Z"])
+    assert len(names) == 5
+
+    page, cursor = main.query_models(sort=sort, limit=1)
+    next_page, _ = main.query_models(sort=sort, limit=1, cursor=cursor)
+    assert next_page != page
+
+
+def test_list_filters():
+    _fill_registry()
+    assert _all_pages(prefix="KTC", status="승인") == ["KTC1", "KTC3", "KTC5", "KTC7"]
+    assert _all_pages(sort="exp_date", exp_from=date(2026, 11, 14), exp_to=date(2026, 11, 16)) == ["KTC6", "KTC5", "KTC4"]
+    assert _all_pages(sort="exp_date", exp_from=date(2026, 11, 19)) == ["KTC1", "KTC0"]
+    assert _all_pages(exp_to=date(2026, 11, 13), status="취소") == ["KTC8"]
+
+
+def test_list_sees_external_file_edit():
+    _fill_registry()
+    main.query_models()
+    with open(main.MODEL_FILE, "w", encoding="utf-8") as f:
+        json.dump([entry("NEW1", "2026.11.01")], f)
+    assert [m["model"] for m in main.query_models()[0]] == ["NEW1"]
+    assert main.find_expiring_models(date(2026, 1, 1), date(2026, 12, 31)) == [(date(2026, 11, 1), "NEW1")]
+
+
+def test_failed_save_keeps_registry(monkeypatch):
+    main.add_model_entry(entry("A", "2026.11.05"))
+
+    def broken_dump(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(main.json, "dump", broken_dump)
+    with pytest.raises(OSError):
+        main.add_model_entry(entry("B", "2026.11.06"))
+    assert [m["model"] for m in main._models_cache] == ["A"]
+
+
+@pytest.mark.parametrize("arg", ["limit=²", "limit=0", "sort=foo", "from=2026-11-01", "color=red"])
+def test_list_command_rejects_bad_options(arg):
+    assert command(f"list {arg}") == f"⚠ 잘못된 list 옵션: `{arg}`"
+
+
+def test_list_command_offers_next_page():
+    _fill_registry()
+    text = command("list prefix=KTC limit=3")
+    assert "- KTC2 |" in text and "- KTC3 |" not in text
+    assert "`/kselnoti list prefix=KTC limit=3 cursor=KTC2`" in text
+
+
+# ------------------------------
+# 크레피아 조회 백엔드
+# ------------------------------
+RESULT_HTML = """<table><tbody><tr>
+<td>1</td><td>x</td><td>2015-012-C1</td><td>#####KTC57 a</td><td>x</td><td>KTC5700 b</td>
+<td>2024.01.01 2029.01.01</td><td>승인</td>
+</tr></tbody></table>"""
+SCRIPT_ONLY_HTML = "<html><body><div id='app'></div><script>render()</script></body></html>"
+
+
+def test_page_needs_browser():
+    assert not main.page_needs_browser(main.BeautifulSoup(RESULT_HTML, "html.parser"))
+    assert not main.page_needs_browser(main.BeautifulSoup("<table><tbody></tbody></table>", "html.parser"))
+    assert main.page_needs_browser(main.BeautifulSoup(SCRIPT_ONLY_HTML, "html.parser"))
+
+
+class StubPool:
+    def __init__(self, available, html=RESULT_HTML):
+        self.available = available
+        self.html = html
+        self.calls = 0
+
+    async def fetch_html(self, model_name):
+        self.calls += 1
+        return self.html
+
+    async def ensure_available(self):
+        return self.available
+
+
+@pytest.mark.parametrize(
+    "backend, aiohttp_html, pool_available, expect_browser, expect_rows",
+    [
+        ("auto", RESULT_HTML, True, False, 1),       # 테이블 있음 → aiohttp 결과 그대로
+        ("auto", SCRIPT_ONLY_HTML, True, True, 1),   # 테이블 없음 → 브라우저로 전환
+        ("auto", SCRIPT_ONLY_HTML, False, False, 0), # 브라우저 없음 → 빈 결과
+        ("aiohttp", SCRIPT_ONLY_HTML, True, False, 0),
+        ("browser", SCRIPT_ONLY_HTML, True, True, 1),
+        ("browser", RESULT_HTML, False, False, 1),   # 풀 비활성 → aiohttp 로 대체
+    ],
+)
+def test_fetch_model_info_backend_choice(monkeypatch, backend, aiohttp_html, pool_available, expect_browser, expect_rows):
+    async def fake_aiohttp(model_name):
+        return aiohttp_html
+
+    pool = StubPool(pool_available)
+    monkeypatch.setattr(main, "FETCH_BACKEND", backend)
+    monkeypatch.setattr(main, "fetch_html_aiohttp", fake_aiohttp)
+    monkeypatch.setattr(main, "browser_pool", pool)
+
+    results = asyncio.run(main.fetch_model_info("KTC5700"))
+    assert pool.calls == (1 if expect_browser else 0)
+    assert len(results) == expect_rows
+    if results:
+        assert results[0]["model"] == "KTC5700" and results[0]["exp_date"] == "2029.01.01"
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def close(self):
+        if self.browser.fail_close:
+            raise RuntimeError("close fail")
+
+
+class FakeNavigation:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def goto(self, url, **kwargs):
+        if self.context.browser.fail_goto:
+            raise RuntimeError("goto fail")
+
+    def expect_navigation(self, **kwargs):
+        return FakeNavigation()
+
+    async def evaluate(self, script, args):
+        pass
+
+    async def content(self):
+        return RESULT_HTML
+
+
+class FakeBrowser:
+    launched = 0
+    fail_warmup = False  # 새로 띄운 브라우저의 첫 goto 실패 여부
+
+    def __init__(self):
+        FakeBrowser.launched += 1
+        self.connected = True
+        self.fail_goto = FakeBrowser.fail_warmup
+        self.fail_close = False
+        self.fail_new_context = False
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self):
+        if self.fail_new_context:
+            raise RuntimeError("newpage fail")
+        return FakeContext(self)
+
+    async def close(self):
+        self.connected = False
+
+
+class FakePlaywright:
+    fail_launch = False
+    launch_delay = 0.0
+
+    def __init__(self):
+        self.chromium = self
+
+    async def start(self):
+        return self
+
+    async def launch(self, **kwargs):
+        await asyncio.sleep(FakePlaywright.launch_delay)
+        if FakePlaywright.fail_launch:
+            raise RuntimeError("launch fail")
+        return FakeBrowser()
+
+    async def stop(self):
+        pass
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    FakeBrowser.launched = 0
+    monkeypatch.setattr(FakeBrowser, "fail_warmup", False)
+    monkeypatch.setattr(FakePlaywright, "fail_launch", False)
+    monkeypatch.setattr(FakePlaywright, "launch_delay", 0.0)
+    monkeypatch.setattr(main, "async_playwright", FakePlaywright)
+    monkeypatch.setattr(main, "BROWSER_TIMEOUT_MS", 200)
+
+
+def test_browser_pool_size_zero_does_not_block(fake_playwright):
+    pool = main.BrowserPool(0)
+    asyncio.run(asyncio.wait_for(pool.start(), 1))
+    assert not pool.available
+
+
+def test_browser_pool_reuses_pages(fake_playwright):
+    async def scenario():
+        pool = main.BrowserPool(1)
+        await pool.start()
+        for _ in range(3):
+            assert await pool.fetch_html("KTC5700") == RESULT_HTML
+        return pool
+
+    pool = asyncio.run(scenario())
+    assert FakeBrowser.launched == 1
+    assert pool._pages.qsize() == 1
+
+
+def test_browser_pool_replaces_failed_page(fake_playwright):
+    async def scenario():
+        pool = main.BrowserPool(1)
+        await pool.start()
+        pool._browser.fail_goto = True
+        pool._browser.fail_close = True
+        with pytest.raises(RuntimeError, match="goto fail"):
+            await pool.fetch_html("KTC5700")
+        pool._browser.fail_goto = False
+        return pool, await pool.fetch_html("KTC5700")
+
+    pool, html = asyncio.run(scenario())
+    assert html == RESULT_HTML
+    assert pool._pages.qsize() == 1
+
+
+def test_browser_pool_relaunches_when_new_page_fails(fake_playwright):
+    async def scenario():
+        pool = main.BrowserPool(1)
+        await pool.start()
+        pool._browser.fail_goto = True
+        pool._browser.fail_new_context = True
+        with pytest.raises(RuntimeError, match="goto fail"):
+            await pool.fetch_html("KTC5700")
+        return pool, await asyncio.wait_for(pool.fetch_html("KTC5700"), 1)
+
+    pool, html = asyncio.run(scenario())
+    assert html == RESULT_HTML
+    assert FakeBrowser.launched == 2
+
+
+def test_browser_pool_relaunches_after_crash(fake_playwright):
+    async def scenario():
+        pool = main.BrowserPool(1)
+        await pool.start()
+        pool._browser.connected = False
+        return await pool.fetch_html("KTC5700")
+
+    assert asyncio.run(scenario()) == RESULT_HTML
+    assert FakeBrowser.launched == 2
+
+
+def test_browser_pool_get_times_out(fake_playwright):
+    async def scenario():
+        pool = main.BrowserPool(1)
+        await pool.start()
+        await pool._pages.get()  # 유일한 페이지를 빌려간 상태
+        with pytest.raises(RuntimeError, match="대기 시간 초과"):
+            await pool.fetch_html("KTC5700")
+
+    asyncio.run(asyncio.wait_for(scenario(), 2))
+
+
+def test_browser_pool_discards_page_on_cancel(fake_playwright):
+    async def scenario():
+        pool = main.BrowserPool(1)
+        await pool.start()
+        original = await pool._pages.get()
+        pool._pages.put_nowait(original)
+
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        original.goto = hang
+        task = asyncio.create_task(pool.fetch_html("KTC5700"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return original, await pool._pages.get()
+
+    original, replacement = asyncio.run(scenario())
+    assert replacement is not original
+
+
+def test_browser_pool_keeps_pages_when_warmup_fails(fake_playwright):
+    FakeBrowser.fail_warmup = True
+
+    async def scenario():
+        pool = main.BrowserPool(2)
+        await pool.start()
+        pool._browser.fail_goto = False
+        return pool, await pool.fetch_html("KTC5700")
+
+    pool, html = asyncio.run(scenario())
+    assert pool.available and html == RESULT_HTML
+
+
+def test_browser_pool_retries_launch_with_backoff(fake_playwright):
+    FakePlaywright.fail_launch = True
+
+    async def scenario():
+        pool = main.BrowserPool(1)
+        await pool.start()
+        assert not pool.available
+        first_delay = pool._retry_delay
+
+        FakePlaywright.fail_launch = False
+        assert not await pool.ensure_available()  # 대기 시간 전에는 재시도하지 않음
+
+        pool._retry_at = 0.0
+        assert await pool.ensure_available()
+        return first_delay, pool
+
+    first_delay, pool = asyncio.run(scenario())
+    assert first_delay == main.BROWSER_RETRY_MIN_SECONDS * 2
+    assert pool._retry_delay == main.BROWSER_RETRY_MIN_SECONDS
+    assert FakeBrowser.launched == 1
+
+
+def test_browser_pool_not_retried_after_close(fake_playwright):
+    async def scenario():
+        pool = main.BrowserPool(1)
+        await pool.start()
+        await pool.close()
+        return await pool.ensure_available()
+
+    assert asyncio.run(scenario()) is False
+    assert FakeBrowser.launched == 1
+
+
+def test_lifespan_does_not_wait_for_browser(monkeypatch, fake_playwright, dooray):
+    FakePlaywright.launch_delay = 5
+    pool = main.BrowserPool(1)
+    monkeypatch.setattr(main, "browser_pool", pool)
+    monkeypatch.setattr(main, "FETCH_BACKEND", "auto")
+    monkeypatch.setattr(main, "BROWSER_POOL_SIZE", 1)
+
+    async def scenario():
+        async with main.lifespan(main.app):
+            assert not pool.available
+
+    asyncio.run(asyncio.wait_for(scenario(), 1))
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, "auto"), ("browser", "browser"), (" Browser ", "browser"), ("aiohttp", "aiohttp"), ("playwright", "auto"),
+])
+def test_read_fetch_backend(value, expected):
+    assert main._read_fetch_backend(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, main.DEFAULT_BROWSER_POOL_SIZE), ("4", 4), ("0", 0), ("-3", 0), ("two", main.DEFAULT_BROWSER_POOL_SIZE),
+])
+def test_read_browser_pool_size(value, expected):
+    assert main._read_browser_pool_size(value) == expected